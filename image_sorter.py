@@ -3,8 +3,8 @@
 # Description:
 # This script creates a graphical application to sort images and videos.
 # It previews images and video thumbnails. Press the spacebar to play videos
-# in a larger pop-up window.
-# Navigate with arrow keys and delete with the Delete key.
+# in a larger pop-up window (using mpv or ffplay).
+# Navigate with arrow keys and move files to the trash with the Delete key.
 # It remembers the last used folder for convenience.
 #
 # Author: Gemini
@@ -12,22 +12,40 @@
 # Requirements:
 # - Python 3
 # - Tkinter (usually included with Python)
-# - Pillow, pillow-heif, OpenCV, and pygame
+# - Pillow, pillow-heif, OpenCV, and Send2Trash
+# - mpv or ffplay (from ffmpeg) for video playback
+# - Optional: pyvips for faster JPEG/HEIC previews
 #
 # How to Install Dependencies:
 # Open your terminal and run:
-# pip install Pillow pillow-heif opencv-python pygame
+# pip install Pillow pillow-heif opencv-python Send2Trash
 
 import os
+import collections
+import concurrent.futures
+import errno
+import hashlib
+import io
+import json
+import mmap
+import re
 import shutil
+import struct
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk, ImageDraw, ImageFont
 import pillow_heif
-import cv2 # OpenCV for video thumbnails and playback
-import pygame # For audio playback
-import tempfile
+import cv2 # OpenCV for video thumbnails
 import subprocess
+import tempfile
+import threading
+import urllib.parse
+from send2trash import send2trash # Reversible deletes
+
+try:
+    import pyvips # Optional: faster, low-memory previews for JPEG and HEIC
+except (ImportError, OSError):
+    pyvips = None
 
 # Register the HEIF/HEIC opener with Pillow
 pillow_heif.register_heif_opener()
@@ -35,6 +53,12 @@ pillow_heif.register_heif_opener()
 class ImageSorterApp:
     """A simple GUI application for sorting images and videos in a folder."""
 
+    # Supported file types, matched case-insensitively without lowercasing each name
+    _EXT_RE = re.compile(r'.+\.(?:png|jpe?g|gif|bmp|heic|mov)\Z', re.IGNORECASE)
+
+    # Largest side of a cached video thumbnail; bigger frames are shrunk first
+    _VIDEO_THUMB_MAX = 1920
+
     def __init__(self, root):
         """Initialize the application."""
         self.root = root
@@ -44,9 +68,42 @@ class ImageSorterApp:
         self.root.minsize(800, 600)
 
         self.folder_path = ""
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        self.thumb_cache_dir = os.path.join(cache_home, 'image_sorter')  # Video thumbnails
         self.image_files = []
+        self.image_paths = []  # Full paths, parallel to image_files
+        self._stat_cache = {}  # video path -> (mtime_ns, size), captured when the folder is scanned
+        self.favorites = set()  # Names of files in the favorites subfolder
         self.current_index = -1
-        self.config_file = os.path.join(os.path.expanduser('~'), '.sorter_config')
+        self.config_file = os.path.join(os.path.expanduser('~'), '.sorter_config.json')
+        self.legacy_config_file = os.path.join(os.path.expanduser('~'), '.sorter_config')
+        self.config = {'last_folder': '', 'thumbs': {}, 'favorites_by_folder': {}}
+        self._config_lock = threading.Lock()  # Thumbnail workers update the manifest too
+
+        # Background preloading of neighbouring files
+        self.preload_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        self.photo_cache = collections.OrderedDict()  # (path, width, height) -> PhotoImage
+        self.photo_cache_limit = 8
+        self._preload_pending = {}  # cache key -> Future of a preload in progress
+        self._spare_photos = {}  # (width, height) -> evicted PhotoImages ready for reuse
+
+        # Background generation of video thumbnails for the whole folder
+        self.thumb_executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count())
+        self._warm_futures = []
+
+        # External video player, looked up once. Prefer mpv, fall back to ffplay (ships with ffmpeg)
+        self.video_player = next((name for name in ('mpv', 'ffplay') if shutil.which(name)), None)
+        self._player = None
+
+        # What is currently shown, as (cache key, PhotoImage), and the pending resize redraw
+        self._last_render = None
+        self._resize_job = None
+        self._container_size = (1, 1)  # Tracked from <Configure> so displays don't query Tk
+        self._hq_job = None  # Pending full-quality redraw of the current preview
+        self._display_job = None  # Pending display after arrow-key navigation
+
+        # (index, path) of recently trashed files, for undo
+        self._undo = collections.deque(maxlen=32)
 
         # Modern color palette
         self.colors = {
@@ -109,9 +166,15 @@ class ImageSorterApp:
                                    highlightbackground=self.colors['border'])
         self.image_container.pack(pady=(0, 20), fill=tk.BOTH, expand=True)
 
-        # Image display label
-        self.image_label = tk.Label(self.image_container, bg=self.colors['surface'])
-        self.image_label.pack(padx=2, pady=2, fill=tk.BOTH, expand=True)
+        # Image display canvas. The image and message items are created once and
+        # updated in place, so Tk can reuse them between files.
+        self.image_canvas = tk.Canvas(self.image_container, bg=self.colors['surface'],
+                                      highlightthickness=0, borderwidth=0)
+        self.image_canvas.pack(padx=2, pady=2, fill=tk.BOTH, expand=True)
+        self.image_canvas.image = None
+        self._canvas_img = self.image_canvas.create_image(0, 0, anchor='center')
+        self._canvas_text = self.image_canvas.create_text(0, 0, anchor='center', justify=tk.CENTER)
+        self.image_canvas.bind('<Configure>', self._center_canvas_items)
 
         # File info bar
         info_bar = tk.Frame(main_frame, bg=self.colors['surface_light'], highlightthickness=1,
@@ -165,8 +228,10 @@ class ImageSorterApp:
         self.root.bind('<Right>', self.show_next_image)
         self.root.bind('<Delete>', self.delete_current_image)
         self.root.bind('<d>', self.delete_current_image)
+        self.root.bind('<u>', self.undo_delete)
         self.root.bind('<space>', self.play_video)
         self.root.bind('<f>', self.add_to_favorites)
+        self.image_container.bind('<Configure>', self._on_container_resize)
 
         # Initial message
         self.show_message("Select a folder to start sorting")
@@ -179,6 +244,19 @@ class ImageSorterApp:
         button.bind('<Enter>', lambda _: button.config(bg=hover_color))
         button.bind('<Leave>', lambda _: button.config(bg=normal_color))
 
+    def _on_container_resize(self, event):
+        """Redraw after the window stops resizing, collapsing bursts of events into one."""
+        self._container_size = (event.width, event.height)
+        if self._resize_job is not None:
+            self.root.after_cancel(self._resize_job)
+        self._resize_job = self.root.after(100, self._redraw_after_resize)
+
+    def _redraw_after_resize(self):
+        """Re-render the current file at the new container size."""
+        self._resize_job = None
+        if 0 <= self.current_index < len(self.image_files):
+            self.display_image()
+
     def select_folder(self):
         """Open a dialog to select a folder."""
         path = filedialog.askdirectory(initialdir=self.folder_path or os.path.expanduser('~'))
@@ -188,17 +266,47 @@ class ImageSorterApp:
     def load_images_from_path(self, path):
         """Loads all supported files from a given path."""
         self.folder_path = path
-        supported_extensions = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.heic', '.mov')
-        
+        self._last_render = None
         try:
-            self.image_files = sorted([
-                f for f in os.listdir(path)
-                if f.lower().endswith(supported_extensions)
-            ])
+            # scandir gives us the file type and full path without a stat per file
+            found = []
+            self._stat_cache = {}
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False) and self._EXT_RE.match(entry.name):
+                        found.append((entry.name, entry.path))
+                        # Only video thumbnails are keyed by mtime/size, so only stat those
+                        if entry.name.lower().endswith('.mov'):
+                            st = entry.stat()
+                            self._stat_cache[entry.path] = (st.st_mtime_ns, st.st_size)
+            found.sort()
+            self.image_files = [name for name, _ in found]
+            self.image_paths = [file_path for _, file_path in found]
         except FileNotFoundError:
             self.show_message(f"Error: Folder not found.\n{path}")
             return
 
+        # Forget thumbnails of videos that are no longer in the folder
+        stale_keys = []
+        with self._config_lock:
+            manifest = self.config['thumbs'].get(path)
+            if manifest is not None:
+                present = set(self.image_files)
+                for filename in [name for name in manifest if name not in present]:
+                    stale_keys.append(manifest.pop(filename)[-1])
+                if not manifest:
+                    del self.config['thumbs'][path]
+        for key in stale_keys:
+            self._remove_cached_thumbnail(key)
+
+        # Start from the saved favorites and check the favorites folder once the UI is idle
+        saved_favorites = self.config['favorites_by_folder'].get(path)
+        if saved_favorites is not None:
+            self.favorites = set(saved_favorites)
+            self.root.after_idle(self._reconcile_favorites, path)
+        else:
+            self._scan_favorites(path)
+
         if not self.image_files:
             messagebox.showinfo("No Files Found", "The selected folder contains no supported files.")
             self.current_index = -1
@@ -206,37 +314,178 @@ class ImageSorterApp:
         else:
             self.current_index = 0
             self.display_image()
+            self._warm_thumbnail_cache()
             self.save_last_folder(path)
 
     def save_last_folder(self, folder_path):
         """Saves the given folder path to the config file."""
+        self.config['last_folder'] = folder_path
+        self.save_config()
+
+    def save_config(self):
+        """Atomically writes the config (last folder, thumbnail manifest, favorites) to disk."""
         try:
-            with open(self.config_file, 'w') as f:
-                f.write(folder_path)
-        except IOError as e:
-            print(f"Warning: Could not save last folder path: {e}")
+            with self._config_lock:
+                data = json.dumps(self.config)
+            fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(self.config_file))
+            with os.fdopen(fd, 'w') as f:
+                f.write(data)
+            os.replace(temp_path, self.config_file)
+        except (IOError, OSError) as e:
+            print(f"Warning: Could not save config file: {e}")
 
     def load_last_folder(self):
-        """Loads images from the last used folder if the config file exists."""
+        """Loads the config file and images from the last used folder."""
+        # Just try to open the files; a separate exists() check would cost an extra stat
         try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    last_folder = f.read().strip()
-                if last_folder and os.path.isdir(last_folder):
-                    self.load_images_from_path(last_folder)
-        except IOError as e:
+            with open(self.config_file, 'r') as f:
+                self.config.update(json.load(f))
+        except FileNotFoundError:
+            try:
+                # Older versions stored just the folder path
+                with open(self.legacy_config_file, 'r') as f:
+                    self.config['last_folder'] = f.read().strip()
+            except FileNotFoundError:
+                pass
+            except IOError as e:
+                print(f"Warning: Could not read config file: {e}")
+        except (IOError, ValueError) as e:
             print(f"Warning: Could not read config file: {e}")
 
-    def get_video_thumbnail(self, video_path):
-        """Extracts the first frame from a video file."""
+        last_folder = self.config.get('last_folder')
+        if last_folder and os.path.isdir(last_folder):
+            self.load_images_from_path(last_folder)
+
+    def _thumb_cache_path(self, video_path):
+        """Return the cache file for a video's thumbnail."""
+        folder, filename = os.path.split(video_path)
+        cached_stat = self._stat_cache.get(video_path)
+        if cached_stat is None:
+            st = os.stat(video_path)
+            cached_stat = (st.st_mtime_ns, st.st_size)
+        mtime, size = cached_stat
+
+        # Reuse the key from the manifest if the video hasn't changed since
+        with self._config_lock:
+            manifest = self.config['thumbs'].setdefault(folder, {})
+            entry = manifest.get(filename)
+        if entry is not None and entry[:2] == [mtime, size]:
+            key = entry[2]
+        else:
+            # Cache key changes whenever the video is modified
+            key = hashlib.sha1(
+                f"{video_path}|{mtime}|{size}".encode()
+            ).hexdigest()
+            with self._config_lock:
+                manifest[filename] = [mtime, size, key]
+            # The thumbnail of the old version is never looked up again
+            if entry is not None and entry[-1] != key:
+                self._remove_cached_thumbnail(entry[-1])
+        return os.path.join(self.thumb_cache_dir, key + ".jpg")
+
+    def _remove_cached_thumbnail(self, key):
+        """Delete a cached thumbnail that no manifest entry refers to any more."""
+        try:
+            os.remove(os.path.join(self.thumb_cache_dir, key + ".jpg"))
+        except OSError:
+            pass  # Never generated, or already gone
+
+    def _warm_thumbnail_cache(self):
+        """Generate missing video thumbnails in the background."""
+        for future in self._warm_futures:
+            future.cancel()
+        self._warm_futures = []
+
+        for filename, video_path in zip(self.image_files, self.image_paths):
+            if not filename.lower().endswith('.mov'):
+                continue
+            try:
+                if os.path.exists(self._thumb_cache_path(video_path)):
+                    continue
+            except OSError:
+                continue
+            self._warm_futures.append(self.thumb_executor.submit(self._warm_thumbnail, video_path))
+
+    def _warm_thumbnail(self, video_path):
+        """Worker thread: build and cache one video thumbnail."""
+        try:
+            self.get_video_thumbnail(video_path)
+        except Exception as e:
+            print(f"Warning: Could not create thumbnail for {video_path}: {e}")
+
+    def _read_first_frame(self, video_path):
+        """Decode the first frame of a video as a PIL image, or None if it can't be read."""
+        # grab() + retrieve() decodes just the first frame, then free the decoder
         cap = cv2.VideoCapture(video_path)
-        success, frame = cap.read()
-        cap.release()
+        success = cap.grab()
         if success:
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image = Image.fromarray(frame_rgb)
+            success, frame = cap.retrieve()
+        cap.release()
+        if not success:
+            return None
+
+        # Shrink large (e.g. 4K) frames with OpenCV's fast area resize before anything else
+        h, w, _ = frame.shape
+        scale = self._VIDEO_THUMB_MAX / max(w, h)
+        if scale < 1:
+            frame = cv2.resize(frame, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+            h, w, _ = frame.shape
+
+        # Pillow's raw decoder swaps BGR to RGB while copying the frame in
+        return Image.frombuffer('RGB', (w, h), frame, 'raw', 'BGR', 0, 1)
 
-            # Add modern video overlay badge
+    def _read_embedded_cover(self, video_path):
+        """Return the cover art stored in a MOV/MP4's moov/udta/meta/ilst/covr atom, or None."""
+        try:
+            with open(video_path, 'rb') as f:
+                end = os.fstat(f.fileno()).st_size
+                for name in (b'moov', b'udta', b'meta', b'ilst', b'covr', b'data'):
+                    # Walk sibling atoms until we find the one we want, then descend into it
+                    while True:
+                        pos = f.tell()
+                        if pos + 8 > end:
+                            return None
+                        size, kind = struct.unpack('>I4s', f.read(8))
+                        header_size = 8
+                        if size == 1:
+                            size = struct.unpack('>Q', f.read(8))[0]
+                            header_size = 16
+                        elif size == 0:
+                            size = end - pos  # Atom runs to the end of the file
+                        if size < header_size:
+                            return None
+                        if kind == name:
+                            break
+                        f.seek(pos + size)
+                    end = pos + size
+
+                    if name == b'meta' and f.read(4) != b'\0\0\0\0':
+                        # QuickTime-style meta has no version/flags field
+                        f.seek(-4, os.SEEK_CUR)
+                    elif name == b'data':
+                        f.seek(8, os.SEEK_CUR)  # Type indicator and locale
+                        cover_bytes = f.read(end - f.tell())
+
+            image = Image.open(io.BytesIO(cover_bytes)).convert('RGB')
+        except (OSError, struct.error):
+            return None
+
+        image.thumbnail((self._VIDEO_THUMB_MAX, self._VIDEO_THUMB_MAX), Image.Resampling.LANCZOS)
+        return image
+
+    def get_video_thumbnail(self, video_path):
+        """Extracts the first frame from a video file, using the on-disk cache when possible."""
+        cached = self._thumb_cache_path(video_path)
+        if os.path.exists(cached):
+            return Image.open(cached)
+
+        # Embedded cover art needs no video decoding at all; otherwise use the first frame
+        image = self._read_embedded_cover(video_path)
+        if image is None:
+            image = self._read_first_frame(video_path)
+        if image is not None:
+            # Add modern video overlay badge. Drawing in 'RGBA' mode blends
+            # translucent fills straight onto the RGB frame, only inside each shape.
             draw = ImageDraw.Draw(image, 'RGBA')
 
             # Badge dimensions
@@ -247,15 +496,11 @@ class ImageSorterApp:
             y = margin
 
             # Draw semi-transparent rounded rectangle background
-            overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
-            overlay_draw = ImageDraw.Draw(overlay)
-            overlay_draw.rounded_rectangle(
+            draw.rounded_rectangle(
                 [(x, y), (x + badge_width, y + badge_height)],
                 radius=12,
                 fill=(20, 20, 20, 200)
             )
-            image = Image.alpha_composite(image.convert('RGBA'), overlay)
-            draw = ImageDraw.Draw(image)
 
             # Add play icon and text
             try:
@@ -276,9 +521,183 @@ class ImageSorterApp:
             draw.text((text_x, y + 14), "VIDEO", fill='white', font=font_large)
             draw.text((text_x, y + 38), "Press Space to play", fill='#a3a3a3', font=font_small)
 
-            return image.convert('RGB')
+            # Save to the thumbnail cache. Write to a temp file first so
+            # other threads never read a half-written thumbnail.
+            try:
+                os.makedirs(self.thumb_cache_dir, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(suffix='.jpg', dir=self.thumb_cache_dir)
+                with os.fdopen(fd, 'wb') as f:
+                    image.save(f, "JPEG", quality=85)
+                os.replace(temp_path, cached)
+            except OSError as e:
+                print(f"Warning: Could not cache thumbnail: {e}")
+
+            return image
         return None
 
+    def _get_container_size(self):
+        """Return the current size of the image container."""
+        # Use parent container for stable size
+        container_width, container_height = self._container_size
+
+        # Ensure dimensions are valid
+        if container_width <= 1 or container_height <= 1:
+            # Use default values on first load
+            container_width = 1000
+            container_height = 600
+
+        return container_width, container_height
+
+    def _get_preview_size(self):
+        """Return the box previews are shrunk into, snapped down to a multiple of 16 px."""
+        # Snapping means small window resizes map to the same size, so cached
+        # previews stay valid, while costing at most 15 px of each side
+        container_width, container_height = self._get_container_size()
+        max_width = container_width - 20  # Padding
+        max_height = container_height - 20
+        if max_width >= 16:
+            max_width -= max_width % 16
+        if max_height >= 16:
+            max_height -= max_height % 16
+        return max(max_width, 1), max(max_height, 1)
+
+    def _load_preview(self, file_path, max_width, max_height):
+        """Decode a file and shrink it to fit the preview box. Safe to call from a worker thread."""
+        image = self._open_preview(file_path, max_width, max_height)
+
+        # Shrink to fit (aspect ratio preserved)
+        image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        return image
+
+    def _open_preview(self, file_path, max_width, max_height):
+        """Open a file for previewing, decoding at a reduced size where the format allows it."""
+        filename = os.path.basename(file_path)
+
+        # libvips decodes and shrinks in one pass when it's available
+        if pyvips is not None and filename.lower().endswith(('.jpg', '.jpeg', '.heic')):
+            image = self._load_vips_preview(file_path, max_width, max_height)
+            if image is not None:
+                return image
+
+        if filename.lower().endswith('.mov'):
+            image = self.get_video_thumbnail(file_path)
+            if image is None:
+                raise IOError("Could not read first frame of video.")
+        else:
+            # Read through a memory map so the decoder works straight from the page cache
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                image = Image.open(mm)
+                # Let libjpeg decode at a reduced scale instead of full resolution. For HEIC,
+                # newer pillow-heif decodes the smallest embedded thumbnail that still covers
+                # the preview instead (older versions ignore draft and decode the full image).
+                if filename.lower().endswith(('.jpg', '.jpeg', '.heic')):
+                    image.draft('RGB', (max_width, max_height))
+                image.load()
+            # Pillow can only resize palette and bilevel images with NEAREST
+            if image.mode in ('P', '1'):
+                image = image.convert('RGB')
+        return image
+
+    def _fit_size(self, image_size, max_width, max_height):
+        """Return the size that fits an image inside the preview box, never enlarging it."""
+        img_width, img_height = image_size
+        scale = min(max_width / img_width, max_height / img_height, 1)
+        return max(1, round(img_width * scale)), max(1, round(img_height * scale))
+
+    def _load_vips_preview(self, file_path, max_width, max_height):
+        """Shrink-on-load a JPEG/HEIC with pyvips. Returns None if libvips can't read it."""
+        try:
+            vi = pyvips.Image.thumbnail(file_path, max_width, height=max_height, size='down')
+            if vi.hasalpha():
+                vi = vi.flatten()
+            # Greyscale, CMYK and 16-bit (e.g. 10-bit HEIC loads as RGB16) all need scaling to 8-bit sRGB
+            if vi.interpretation != 'srgb' or vi.format != 'uchar':
+                vi = vi.colourspace('srgb')
+            buf = vi.write_to_memory()
+        except pyvips.Error as e:
+            print(f"Warning: pyvips could not load {file_path}, using Pillow: {e}")
+            return None
+        return Image.frombytes('RGB', (vi.width, vi.height), buf)
+
+    def _make_photo(self, image):
+        """Create a PhotoImage, pasting into a spare one of the same size when available."""
+        # Convert after shrinking, so only preview-sized pixels are touched. Keeping
+        # every PhotoImage in RGB also means any spare can take any image.
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        spares = self._spare_photos.get(image.size)
+        if spares:
+            photo = spares.pop()
+            photo.paste(image)
+            return photo
+        return ImageTk.PhotoImage(image)
+
+    def _cache_photo(self, cache_key, photo):
+        """Store a PhotoImage in the LRU cache, evicting the oldest entries."""
+        self.photo_cache[cache_key] = photo
+        self.photo_cache.move_to_end(cache_key)
+        while len(self.photo_cache) > self.photo_cache_limit:
+            _, evicted = self.photo_cache.popitem(last=False)
+            if self._last_render is None or evicted is not self._last_render[1]:
+                self._recycle_photo(evicted)
+
+    def _recycle_photo(self, photo):
+        """Keep a couple of unused PhotoImages per size so their Tk buffers can be reused."""
+        spares = self._spare_photos.setdefault((photo.width(), photo.height()), [])
+        if len(spares) < 2:
+            spares.append(photo)
+
+    def _set_displayed(self, cache_key, photo):
+        """Show a preview and recycle the previous one if nothing else holds on to it."""
+        previous = self._last_render[1] if self._last_render is not None else None
+        self._show_photo(photo)
+        self._last_render = (cache_key, photo)
+
+        # Quick previews are never cached, so their buffers would otherwise be thrown away
+        if previous is not None and previous is not photo and \
+                not any(cached is previous for cached in self.photo_cache.values()):
+            self._recycle_photo(previous)
+
+    def _preload_neighbors(self, max_width, max_height):
+        """Decode the files up to two steps either side in the background, nearest first."""
+        wanted = []
+        for offset in (1, -1, 2, -2):
+            index = self.current_index + offset
+            if 0 <= index < len(self.image_files):
+                file_path = self.image_paths[index]
+                wanted.append((file_path, max_width, max_height))
+
+        # Drop queued preloads for files we've navigated away from
+        for cache_key, future in list(self._preload_pending.items()):
+            if cache_key not in wanted and future.cancel():
+                del self._preload_pending[cache_key]
+
+        for cache_key in wanted:
+            if cache_key in self.photo_cache or cache_key in self._preload_pending:
+                continue
+            self._preload_pending[cache_key] = self.preload_executor.submit(self._prepare_photo, cache_key)
+
+    def _prepare_photo(self, cache_key):
+        """Worker thread: decode a preview, then hand it to the main thread."""
+        file_path, max_width, max_height = cache_key
+        try:
+            image = self._load_preview(file_path, max_width, max_height)
+        except Exception as e:
+            print(f"Warning: Could not preload {file_path}: {e}")
+            image = None
+
+        # Tk objects must be created on the main thread
+        try:
+            self.root.after(0, self._finish_preload, cache_key, image)
+        except (RuntimeError, tk.TclError):
+            pass  # Window was closed
+
+    def _finish_preload(self, cache_key, image):
+        """Main thread: turn a preloaded image into a cached PhotoImage."""
+        self._preload_pending.pop(cache_key, None)
+        if image is not None:
+            self._cache_photo(cache_key, self._make_photo(image))
+
     def display_image(self):
         """Load and display the current file's preview."""
         if self.current_index < 0 or self.current_index >= len(self.image_files):
@@ -287,8 +706,13 @@ class ImageSorterApp:
 
         try:
             filename = self.image_files[self.current_index]
-            file_path = os.path.join(self.folder_path, filename)
-            image = None
+            file_path = self.image_paths[self.current_index]
+            max_width, max_height = self._get_preview_size()
+
+            # Nothing to do if this exact preview is already on screen
+            cache_key = (file_path, max_width, max_height)
+            if self._last_render is not None and self._last_render[0] == cache_key:
+                return
 
             is_video = filename.lower().endswith('.mov')
 
@@ -308,83 +732,102 @@ class ImageSorterApp:
                 shortcuts_text = "← Previous  •  → Next  •  F Toggle Favorite  •  Delete Remove"
             self.shortcuts_label.config(text=shortcuts_text)
 
-            if is_video:
-                image = self.get_video_thumbnail(file_path)
-                if image is None:
-                    raise IOError("Could not read first frame of video.")
-            else:
-                image = Image.open(file_path)
-                if image.mode == 'RGBA':
-                    image = image.convert('RGB')
-
-            # Get container dimensions (use parent container for stable size)
-            container_width = self.image_container.winfo_width()
-            container_height = self.image_container.winfo_height()
-
-            # Ensure dimensions are valid
-            if container_width <= 1 or container_height <= 1:
-                # Use default values on first load
-                container_width = 1000
-                container_height = 600
-
-            # Calculate aspect ratio preserving size
-            img_width, img_height = image.size
-            aspect_ratio = img_width / img_height
-            container_aspect = container_width / container_height
-
-            if aspect_ratio > container_aspect:
-                # Image is wider than container
-                new_width = container_width - 20  # Padding
-                new_height = int(new_width / aspect_ratio)
-            else:
-                # Image is taller than container
-                new_height = container_height - 20  # Padding
-                new_width = int(new_height * aspect_ratio)
+            # A new file is going on screen, so any pending quality upgrade is stale
+            if self._hq_job is not None:
+                self.root.after_cancel(self._hq_job)
+                self._hq_job = None
 
-            # Resize image with calculated dimensions
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+            # Use the preloaded preview if we have one, otherwise decode now
+            photo = self.photo_cache.get(cache_key)
+            if photo is not None:
+                self.photo_cache.move_to_end(cache_key)
+            else:
+                image = self._open_preview(file_path, max_width, max_height)
+                fit_size = self._fit_size(image.size, max_width, max_height)
+                if fit_size == image.size:
+                    photo = self._make_photo(image)
+                    self._cache_photo(cache_key, photo)
+                else:
+                    # Show a quick low-quality resize now, and the proper one if the user stays here
+                    photo = self._make_photo(image.resize(fit_size, Image.Resampling.BILINEAR, reducing_gap=2.0))
+                    self._hq_job = self.root.after(150, self._upgrade_hq, cache_key, image)
 
-            photo = ImageTk.PhotoImage(image)
-            self.image_label.config(image=photo, text="")
-            self.image_label.image = photo
+            self._set_displayed(cache_key, photo)
 
             self.root.title(f"Camera Roll Cleaner ({self.current_index + 1}/{len(self.image_files)})")
 
+            self._preload_neighbors(max_width, max_height)
+
         except Exception as e:
+            self._last_render = None
             error_message = f"Error loading file: {self.image_files[self.current_index]}\n\n{e}"
-            self.image_label.config(image=None, text=error_message, fg=self.colors['danger'],
-                                   font=('SF Pro Text', 13))
-            self.image_label.image = None
+            self._show_text(error_message, self.colors['danger'], ('SF Pro Text', 13))
+
+    def _upgrade_hq(self, cache_key, image):
+        """Replace the quick preview with a full-quality resize if it's still on screen."""
+        self._hq_job = None
+        if self._last_render is None or self._last_render[0] != cache_key:
+            return
+
+        _, max_width, max_height = cache_key
+        image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        photo = self._make_photo(image)
+        self._cache_photo(cache_key, photo)
+        self._set_displayed(cache_key, photo)
+
+    def _center_canvas_items(self, event):
+        """Keep the image and message centered when the canvas is resized."""
+        self.image_canvas.coords(self._canvas_img, event.width // 2, event.height // 2)
+        self.image_canvas.coords(self._canvas_text, event.width // 2, event.height // 2)
+
+    def _show_photo(self, photo):
+        """Show a PhotoImage in the canvas, hiding any message."""
+        self.image_canvas.itemconfig(self._canvas_text, text="")
+        self.image_canvas.itemconfig(self._canvas_img, image=photo)
+        self.image_canvas.image = photo  # Keep a reference so Tk doesn't lose the image
+
+    def _show_text(self, text, color, font):
+        """Show a message in the canvas in place of the image."""
+        self.image_canvas.itemconfig(self._canvas_img, image="")
+        self.image_canvas.itemconfig(self._canvas_text, text=text, fill=color, font=font)
+        self.image_canvas.image = None
 
     def show_message(self, message):
-        """Display a message in the image label area."""
+        """Display a message in the image area."""
         self.shortcuts_label.config(text="← Previous  •  → Next  •  F Toggle Favorite  •  Delete Remove")
         self.file_counter_label.config(text="")
         self.filename_label.config(text="")
-        self.image_label.config(
-            image=None,
-            text=message,
-            fg=self.colors['text_secondary'],
-            bg=self.colors['surface'],
-            font=('SF Pro Text', 16)
-        )
-        self.image_label.image = None
+        self._show_text(message, self.colors['text_secondary'], ('SF Pro Text', 16))
+        self._last_render = None
         self.root.title("Camera Roll Cleaner")
 
     def show_next_image(self, event=None):
         """Navigate to the next file."""
         if self.image_files and self.current_index < len(self.image_files) - 1:
             self.current_index += 1
-            self.display_image()
+            self._schedule_display()
 
     def show_prev_image(self, event=None):
         """Navigate to the previous file."""
         if self.image_files and self.current_index > 0:
             self.current_index -= 1
-            self.display_image()
+            self._schedule_display()
+
+    def _schedule_display(self):
+        """Display the current file once Tk is idle, so a burst of key repeats renders only once."""
+        # Tk handles every queued key event before idle callbacks, so a single press still
+        # draws immediately. current_index is updated right away so delete/favorite act on
+        # the file navigated to.
+        if self._display_job is None:
+            self._display_job = self.root.after_idle(self._do_display)
+
+    def _do_display(self):
+        """Run a display scheduled by _schedule_display."""
+        self._display_job = None
+        self.display_image()
 
     def play_video(self, event=None):
-        """Play the current video file in a large, new window with audio."""
+        """Play the current video file with audio in an external player window."""
         if self.current_index == -1 or not self.image_files:
             return
 
@@ -392,89 +835,46 @@ class ImageSorterApp:
         if not filename.lower().endswith('.mov'):
             return
 
-        file_path = os.path.join(self.folder_path, filename)
+        file_path = self.image_paths[self.current_index]
+        window_title = f"Playing: {filename}"
 
-        try:
-            cap = cv2.VideoCapture(file_path)
-            if not cap.isOpened():
-                messagebox.showerror("Playback Error", "Cannot open video file.")
-                return
+        if self.video_player == 'mpv':
+            # Hardware decoding where supported
+            command = ['mpv', '--force-window=yes', '--geometry=1280x720', '--hwdec=auto-safe',
+                       '--title=' + window_title, file_path]
+        elif self.video_player == 'ffplay':
+            command = ['ffplay', '-autoexit', '-x', '1280', '-y', '720',
+                       '-window_title', window_title, file_path]
+        else:
+            messagebox.showerror("Playback Error", "No video player found.\n\nPlease install mpv or ffmpeg.")
+            return
 
-            # Get video FPS for proper timing
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            if fps == 0:
-                fps = 30  # Default fallback
-            delay = int(1000 / fps)  # milliseconds per frame
+        # Only keep one player window open at a time
+        if self._player is not None and self._player.poll() is None:
+            self._player.terminate()
 
-            window_name = f"Playing: {filename}"
-            cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-            # Set a larger default size for the video window
-            cv2.resizeWindow(window_name, 1280, 720)
+        try:
+            # Fire and forget so the UI stays responsive during playback
+            self._player = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            messagebox.showerror("Playback Error", f"An error occurred while playing the video:\n\n{e}")
 
-            # Initialize pygame mixer for audio
-            audio_temp_file = None
-            try:
-                pygame.mixer.init()
-
-                # Extract audio to temporary file using ffmpeg
-                audio_temp_file = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                audio_path = audio_temp_file.name
-                audio_temp_file.close()
-
-                # Extract audio with ffmpeg (suppressing output)
-                result = subprocess.run(
-                    ['ffmpeg', '-i', file_path, '-vn', '-acodec', 'pcm_s16le', '-ar', '44100', '-ac', '2', '-y', audio_path],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-
-                # Play audio if extraction succeeded
-                has_audio = result.returncode == 0 and os.path.exists(audio_path) and os.path.getsize(audio_path) > 0
-                if has_audio:
-                    pygame.mixer.music.load(audio_path)
-                    pygame.mixer.music.play()
-
-            except Exception as audio_error:
-                print(f"Warning: Could not load audio: {audio_error}")
-                has_audio = False
-
-            # Play video
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break # Video ended
-
-                cv2.imshow(window_name, frame)
-
-                # Exit on 'q' key or if window is closed
-                key_pressed = cv2.waitKey(delay) & 0xFF
-                if key_pressed == ord('q') or cv2.getWindowProperty(window_name, cv2.WND_PROP_VISIBLE) < 1:
-                    break
-
-            # Cleanup
-            cap.release()
-            cv2.destroyWindow(window_name)
-
-            # Stop audio and cleanup
-            if has_audio:
-                pygame.mixer.music.stop()
-                pygame.mixer.quit()
-
-            # Delete temporary audio file
-            if audio_temp_file and os.path.exists(audio_path):
-                try:
-                    os.unlink(audio_path)
-                except:
-                    pass
+    def _scan_favorites(self, path):
+        """Read the favorites folder into the favorites set and the config."""
+        favorites_folder = os.path.join(path, "favorites")
+        self.favorites = set(os.listdir(favorites_folder)) if os.path.isdir(favorites_folder) else set()
+        self.config['favorites_by_folder'][path] = sorted(self.favorites)
 
-        except Exception as e:
-            messagebox.showerror("Playback Error", f"An error occurred while playing the video:\n\n{e}")
+    def _reconcile_favorites(self, path):
+        """Sync the saved favorites with the favorites folder once the UI is idle."""
+        if path != self.folder_path:
+            return
+        self._scan_favorites(path)
+        self.update_favorite_indicator()
 
     def is_favorited(self, filename):
         """Check if a file is in the favorites folder."""
-        favorites_folder = os.path.join(self.folder_path, "favorites")
-        destination_path = os.path.join(favorites_folder, filename)
-        return os.path.exists(destination_path)
+        return filename in self.favorites
 
     def add_to_favorites(self, event=None):
         """Toggle the current file in/out of the favorites subfolder."""
@@ -483,7 +883,7 @@ class ImageSorterApp:
             return
 
         filename = self.image_files[self.current_index]
-        source_path = os.path.join(self.folder_path, filename)
+        source_path = self.image_paths[self.current_index]
 
         # Create favorites subfolder if it doesn't exist
         favorites_folder = os.path.join(self.folder_path, "favorites")
@@ -494,21 +894,57 @@ class ImageSorterApp:
             if self.is_favorited(filename):
                 # Remove from favorites
                 os.remove(destination_path)
+                self.favorites.discard(filename)
                 print(f"Removed from favorites: {destination_path}")
                 self.show_temporary_message("☆ Removed from favorites", 1500)
             else:
                 # Add to favorites
                 os.makedirs(favorites_folder, exist_ok=True)
-                shutil.copy2(source_path, destination_path)
+                try:
+                    # A hard link is instant and takes no extra space
+                    os.link(source_path, destination_path)
+                except FileExistsError:
+                    # Already favorited, e.g. by another instance since we last scanned
+                    pass
+                except OSError as e:
+                    # Different filesystem or no hard link support
+                    if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.EOPNOTSUPP):
+                        raise
+                    self._copy_file(source_path, destination_path)
+                self.favorites.add(filename)
                 print(f"Added to favorites: {destination_path}")
                 self.show_temporary_message("⭐ Added to favorites!", 1500)
 
+            self.config['favorites_by_folder'][self.folder_path] = sorted(self.favorites)
+
             # Update display to reflect favorite status
             self.update_favorite_indicator()
 
         except Exception as e:
             messagebox.showerror("Error", f"Could not toggle favorite.\n\n{e}")
 
+    def _copy_file(self, source_path, destination_path):
+        """Copy a file in the kernel (reflink on CoW filesystems), falling back to a plain copy."""
+        with open(source_path, 'rb') as src:
+            # 'x' never overwrites, so an existing file (maybe the source itself) can't be truncated
+            dst = open(destination_path, 'xb')
+            try:
+                with dst:
+                    try:
+                        while os.copy_file_range(src.fileno(), dst.fileno(), 2**30) > 0:
+                            pass
+                    except (AttributeError, OSError):
+                        # copy_file_range is Linux-only and not supported by every filesystem
+                        src.seek(0)
+                        dst.seek(0)
+                        dst.truncate()
+                        shutil.copyfileobj(src, dst)
+                shutil.copystat(source_path, destination_path)
+            except Exception:
+                # Don't leave a half-written copy in the favorites folder
+                os.remove(destination_path)
+                raise
+
     def update_favorite_indicator(self):
         """Update the filename display to show favorite status."""
         if self.current_index == -1 or not self.image_files:
@@ -523,13 +959,13 @@ class ImageSorterApp:
     def show_temporary_message(self, message, duration_ms):
         """Show a temporary overlay message on the image."""
         # Create a semi-transparent overlay
-        if hasattr(self.image_label, 'image') and self.image_label.image:
+        if self.image_canvas.image:
             # Save current image
-            saved_image = self.image_label.image
+            saved_image = self.image_canvas.image
 
             # Create overlay label
             overlay = tk.Label(
-                self.image_label,
+                self.image_canvas,
                 text=message,
                 bg=self.colors['accent'],
                 fg=self.colors['text_primary'],
@@ -543,36 +979,114 @@ class ImageSorterApp:
             self.root.after(duration_ms, overlay.destroy)
 
     def delete_current_image(self, event=None):
-        """Delete the currently displayed file."""
+        """Move the currently displayed file to the trash."""
         if self.current_index == -1 or not self.image_files:
             messagebox.showwarning("No File", "There is no file to delete.")
             return
 
-        filename = self.image_files[self.current_index]
-        image_path = os.path.join(self.folder_path, filename)
+        image_path = os.path.abspath(self.image_paths[self.current_index])
 
-        is_sure = messagebox.askyesno(
-            "Confirm Delete",
-            f"Are you sure you want to permanently delete this file?\n\n{filename}"
-        )
+        try:
+            send2trash(image_path)
+            print(f"Moved to trash: {image_path}")
+            self._undo.append((self.current_index, image_path))
+            self.image_files.pop(self.current_index)
+            self._stat_cache.pop(self.image_paths.pop(self.current_index), None)
+            if self.current_index >= len(self.image_files) and self.image_files:
+                self.current_index -= 1
+
+            if self.image_files:
+                self.display_image()
+                self.show_temporary_message("🗑 Moved to trash — press U to undo", 1500)
+            else:
+                self.show_message("Folder is now empty.\n\nPress U to undo.")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not delete file.\n\n{e}")
+
+    def undo_delete(self, event=None):
+        """Restore the most recently trashed file."""
+        if not self._undo:
+            return
 
-        if is_sure:
+        index, image_path = self._undo.pop()
+        try:
+            trashed = self._find_in_trash(image_path)
+            if trashed is None:
+                raise FileNotFoundError("The file is no longer in the trash.")
+            if os.path.exists(image_path):
+                raise FileExistsError(f"A file named {os.path.basename(image_path)} already exists.")
+            trashed_path, info_path = trashed
+            os.rename(trashed_path, image_path)
+            os.remove(info_path)
+            print(f"Restored from trash: {image_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not restore file.\n\n{e}")
+            return
+
+        # Put it back where it was if we're still in the same folder
+        folder, filename = os.path.split(image_path)
+        if folder == os.path.abspath(self.folder_path):
+            index = min(index, len(self.image_files))
+            self.image_files.insert(index, filename)
+            restored_path = os.path.join(self.folder_path, filename)
+            self.image_paths.insert(index, restored_path)
+            if filename.lower().endswith('.mov'):
+                st = os.stat(image_path)
+                self._stat_cache[restored_path] = (st.st_mtime_ns, st.st_size)
+            self.current_index = index
+            self.display_image()
+            self.show_temporary_message("↩ Restored from trash", 1500)
+
+    def _find_in_trash(self, original_path):
+        """Locate a trashed file in the freedesktop.org trash. Returns (file, info file) or None."""
+        data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+        trash_dirs = [(os.path.join(data_home, 'Trash'), None)]
+
+        # Files on other drives go to that drive's own trash, with paths relative to its mount point
+        mount = os.path.dirname(original_path)
+        while not os.path.ismount(mount):
+            mount = os.path.dirname(mount)
+        trash_dirs.append((os.path.join(mount, f".Trash-{os.getuid()}"), mount))
+        trash_dirs.append((os.path.join(mount, ".Trash", str(os.getuid())), mount))
+
+        best = None
+        for trash_dir, top_dir in trash_dirs:
+            info_dir = os.path.join(trash_dir, 'info')
             try:
-                os.remove(image_path)
-                print(f"Deleted: {image_path}")
-                self.image_files.pop(self.current_index)
-                if self.current_index >= len(self.image_files) and self.image_files:
-                    self.current_index -= 1
-                
-                if self.image_files:
-                    self.display_image()
-                else:
-                    self.show_message("Folder is now empty.")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not delete file.\n\n{e}")
+                info_names = os.listdir(info_dir)
+            except OSError:
+                continue
+
+            for info_name in info_names:
+                if not info_name.endswith('.trashinfo'):
+                    continue
+                info_path = os.path.join(info_dir, info_name)
+                path = None
+                deletion_date = ''
+                try:
+                    with open(info_path, 'r') as f:
+                        for line in f:
+                            if line.startswith('Path='):
+                                path = urllib.parse.unquote(line[len('Path='):].strip())
+                            elif line.startswith('DeletionDate='):
+                                deletion_date = line[len('DeletionDate='):].strip()
+                except (IOError, UnicodeDecodeError):
+                    continue
+
+                if path and top_dir and not os.path.isabs(path):
+                    path = os.path.join(top_dir, path)
+                # Several trashed files can share a path; the newest one is ours
+                if path == original_path and (best is None or deletion_date > best[0]):
+                    trashed_path = os.path.join(trash_dir, 'files', info_name[:-len('.trashinfo')])
+                    best = (deletion_date, trashed_path, info_path)
+
+        return best[1:] if best else None
 
 if __name__ == "__main__":
     root = tk.Tk()
     app = ImageSorterApp(root)
     root.mainloop()
+    app.save_config()
+    app.preload_executor.shutdown(wait=False, cancel_futures=True)
+    app.thumb_executor.shutdown(wait=False, cancel_futures=True)
 